@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import flights_router, gantt_router
+from .routes import flights_router, gantt_router, admin_router
+from .utils import CompressionMiddleware, ProfilingMiddleware
 
 # Create FastAPI application
 app = FastAPI(
@@ -23,9 +24,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiate gzip / zstd / brotli for large responses
+app.add_middleware(CompressionMiddleware)
+
+# Opt-in per-request profiling (requires PROFILING_ADMIN_TOKEN)
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(flights_router)
 app.include_router(gantt_router)
+app.include_router(admin_router)
 
 
 @app.get("/")
@@ -40,7 +48,9 @@ async def root():
             "bulk_flights": "/api/v1/flights/bulk",
             "planes": "/api/v1/planes",
             "gantt_trips": "/api/v1/gantt/trips",
-            "gantt_ground_time": "/api/v1/gantt/ground-time"
+            "gantt_ground_time": "/api/v1/gantt/ground-time",
+            "gantt_rotations": "/api/v1/gantt/rotations",
+            "admin_profiles": "/api/v1/admin/profiles"
         }
     }
 
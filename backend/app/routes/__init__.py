@@ -1,4 +1,5 @@
 from .flights import router as flights_router
 from .gantt import router as gantt_router
+from .admin import router as admin_router
 
-__all__ = ["flights_router", "gantt_router"]
+__all__ = ["flights_router", "gantt_router", "admin_router"]
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, HTTPException, Request, status, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from ..utils.profiling import profile_store, is_admin_request
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+def _require_admin(request: Request):
+    """Reject requests without a valid admin token"""
+    if not is_admin_request(request):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
+
+
+@router.get("/profiles")
+async def list_profiles(request: Request):
+    """List stored request profiles, newest first"""
+    _require_admin(request)
+    profiles = profile_store.list_profiles()
+    return {
+        "total": len(profiles),
+        "maxProfiles": profile_store.max_profiles,
+        "profiles": profiles
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    request: Request,
+    profile_id: str,
+    format: str = Query("pstats", description="pstats (binary download) or text"),
+    sort: str = Query("cumulative", description="pstats sort key for the text format"),
+    limit: int = Query(100, ge=1, description="Number of rows in the text format")
+):
+    """Download a stored request profile"""
+    _require_admin(request)
+
+    if format not in ("pstats", "text"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid format. Use 'pstats' or 'text'"
+        )
+
+    profile_file = profile_store.get_path(profile_id)
+    if profile_file is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+
+    if format == "text":
+        try:
+            report = profile_store.render_text(profile_id, sort=sort, limit=limit)
+        except KeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sort key: {sort}"
+            )
+        return PlainTextResponse(report)
+
+    return FileResponse(
+        profile_file,
+        media_type="application/octet-stream",
+        filename=profile_file.name
+    )
@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, status
 from typing import List
 from ..schemas import FlightCreate, FlightResponse, BulkFlightCreate, BulkFlightResponse
 from ..services import FlightService
+from ..utils.serialization import FastJSONResponse
+from ..utils.timeutils import format_timestamp, parse_timestamp
 
 router = APIRouter(prefix="/api/v1", tags=["flights"])
 flight_service = FlightService()
@@ -28,23 +30,9 @@ async def create_flight(flight: FlightCreate):
 @router.post("/flights/bulk", response_model=BulkFlightResponse, status_code=status.HTTP_201_CREATED)
 async def create_bulk_flights(bulk_data: BulkFlightCreate):
     """Create multiple flight records at once"""
-    created = 0
-    failed = 0
-    errors = []
-
-    for idx, flight in enumerate(bulk_data.flights):
-        try:
-            flight_service.create_flight(flight.model_dump())
-            created += 1
-        except Exception as e:
-            failed += 1
-            errors.append(f"Flight {idx + 1}: {str(e)}")
-
-    return {
-        "created": created,
-        "failed": failed,
-        "errors": errors
-    }
+    return flight_service.create_flights_bulk(
+        [flight.model_dump() for flight in bulk_data.flights]
+    )
 
 
 @router.get("/flights")
@@ -65,21 +53,14 @@ async def get_flights(
 
         # Filter by time range if provided
         if startTime and endTime:
-            from datetime import datetime
-            start_dt = datetime.fromisoformat(startTime.replace('Z', '+00:00'))
-            end_dt = datetime.fromisoformat(endTime.replace('Z', '+00:00'))
-
-            filtered_flights = []
-            for flight in all_flights:
-                dept_dt = datetime.fromisoformat(flight['departure_time'].replace('Z', '+00:00'))
-                arr_dt = datetime.fromisoformat(flight['arrival_time'].replace('Z', '+00:00'))
-
-                if (start_dt <= dept_dt <= end_dt or
-                    start_dt <= arr_dt <= end_dt or
-                    (dept_dt < start_dt and arr_dt > end_dt)):
-                    filtered_flights.append(flight)
+            # Stored timestamps are canonical UTC, so string order is time order
+            start_time = format_timestamp(parse_timestamp(startTime))
+            end_time = format_timestamp(parse_timestamp(endTime))
 
-            all_flights = filtered_flights
+            all_flights = [
+                f for f in all_flights
+                if f['departure_time'] <= end_time and f['arrival_time'] >= start_time
+            ]
 
         total = len(all_flights)
         paginated_flights = all_flights[offset:offset + limit]
@@ -95,12 +76,12 @@ async def get_flights(
             'createdAt': f['created_at']
         } for f in paginated_flights]
 
-        return {
+        return FastJSONResponse({
             "total": total,
             "limit": limit,
             "offset": offset,
             "flights": flights
-        }
+        })
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -118,9 +99,8 @@ async def get_planes():
         for plane_id in plane_ids:
             flights = flight_service.get_flights_by_plane(plane_id)
             if flights:
-                # Sort by departure time to get the last flight
-                sorted_flights = sorted(flights, key=lambda x: x['departure_time'])
-                last_flight = sorted_flights[-1]['departure_time']
+                # Canonical timestamps: the largest string is the last flight
+                last_flight = max(f['departure_time'] for f in flights)
 
                 planes.append({
                     "planeId": plane_id,
@@ -128,7 +108,7 @@ async def get_planes():
                     "lastFlight": last_flight
                 })
 
-        return {"planes": planes}
+        return FastJSONResponse({"planes": planes})
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
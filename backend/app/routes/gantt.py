@@ -1,18 +1,59 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, Request, Response, status, Query
 from typing import List
-from ..schemas import GanttTripsResponse, GanttGroundTimeResponse
-from ..services import FlightService, GanttService
+from ..schemas import GanttTripsResponse, GanttGroundTimeResponse, RotationsResponse, Trip, GroundPeriod
+from ..services import FlightService, GanttService, RotationService
+from ..utils.compression import PayloadCache, compress, get_min_size, negotiate_encoding
+from ..utils.serialization import dumps, parse_fields, project_items
+from ..utils.timeutils import parse_timestamp
 
 router = APIRouter(prefix="/api/v1/gantt", tags=["gantt"])
 flight_service = FlightService()
-gantt_service = GanttService(flight_service)
+rotation_service = RotationService(flight_service)
+gantt_service = GanttService(flight_service, rotation_service)
+payload_cache = PayloadCache()
+
+
+def _cached_json_response(request: Request, key: tuple, build) -> Response:
+    """Serve a Gantt payload from the cache, compressing each encoding once"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+
+    if getattr(request.state, "profiling", False):
+        # Profiled requests always build and encode the payload so the
+        # profile shows where a slow query spends its time
+        body = dumps(build())
+        if encoding is None or len(body) < get_min_size():
+            return Response(content=body, media_type="application/json")
+        return Response(
+            content=compress(body, encoding),
+            media_type="application/json",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+        )
+
+    # Any write to the flight data invalidates cached payloads
+    version = flight_service.get_data_version()
+    body = payload_cache.get(key, version)
+    if body is None:
+        body = dumps(build())
+        payload_cache.put(key, version, body)
+
+    # Uncompressed bodies are left to CompressionMiddleware, which adds Vary
+    if encoding is None or len(body) < get_min_size():
+        return Response(content=body, media_type="application/json")
+
+    return Response(
+        content=payload_cache.get_encoded(key, version, body, encoding),
+        media_type="application/json",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
 
 
 @router.get("/trips", response_model=GanttTripsResponse)
 async def get_trips(
+    request: Request,
     planeIds: str = Query(..., description="Comma-separated list of plane IDs"),
     startTime: str = Query(..., description="ISO 8601 start time"),
-    endTime: str = Query(..., description="ISO 8601 end time")
+    endTime: str = Query(..., description="ISO 8601 end time"),
+    fields: str = Query(None, description="Comma-separated list of trip fields to return")
 ):
     """Get trip schedule data for Gantt chart"""
     try:
@@ -25,21 +66,35 @@ async def get_trips(
                 detail="At least one plane ID must be provided"
             )
 
-        # Validate datetime formats
-        from datetime import datetime
+        # Validate field projection
         try:
-            datetime.fromisoformat(startTime.replace('Z', '+00:00'))
-            datetime.fromisoformat(endTime.replace('Z', '+00:00'))
+            field_list = parse_fields(fields, set(Trip.model_fields))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        # Parse datetimes once; services work on parsed values
+        try:
+            start_dt = parse_timestamp(startTime)
+            end_dt = parse_timestamp(endTime)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid datetime format. Use ISO 8601 format"
             )
 
-        # Get trips data
-        result = gantt_service.get_trips_data(plane_id_list, startTime, endTime)
-
-        return result
+        # Trusted service output: skip response_model revalidation
+        return _cached_json_response(
+            request,
+            ('trips', tuple(plane_id_list), start_dt, end_dt, fields),
+            lambda: project_items(
+                gantt_service.get_trips_data(plane_id_list, start_dt, end_dt),
+                'trips',
+                field_list
+            )
+        )
 
     except HTTPException:
         raise
@@ -52,9 +107,11 @@ async def get_trips(
 
 @router.get("/ground-time", response_model=GanttGroundTimeResponse)
 async def get_ground_time(
+    request: Request,
     planeIds: str = Query(..., description="Comma-separated list of plane IDs"),
     startTime: str = Query(..., description="ISO 8601 start time"),
-    endTime: str = Query(..., description="ISO 8601 end time")
+    endTime: str = Query(..., description="ISO 8601 end time"),
+    fields: str = Query(None, description="Comma-separated list of ground period fields to return")
 ):
     """Get ground time schedule data for Gantt chart"""
     try:
@@ -67,21 +124,35 @@ async def get_ground_time(
                 detail="At least one plane ID must be provided"
             )
 
-        # Validate datetime formats
-        from datetime import datetime
+        # Validate field projection
+        try:
+            field_list = parse_fields(fields, set(GroundPeriod.model_fields))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        # Parse datetimes once; services work on parsed values
         try:
-            datetime.fromisoformat(startTime.replace('Z', '+00:00'))
-            datetime.fromisoformat(endTime.replace('Z', '+00:00'))
+            start_dt = parse_timestamp(startTime)
+            end_dt = parse_timestamp(endTime)
         except ValueError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid datetime format. Use ISO 8601 format"
             )
 
-        # Get ground time data
-        result = gantt_service.get_ground_time_data(plane_id_list, startTime, endTime)
-
-        return result
+        # Trusted service output: skip response_model revalidation
+        return _cached_json_response(
+            request,
+            ('ground-time', tuple(plane_id_list), start_dt, end_dt, fields),
+            lambda: project_items(
+                gantt_service.get_ground_time_data(plane_id_list, start_dt, end_dt),
+                'groundPeriods',
+                field_list
+            )
+        )
 
     except HTTPException:
         raise
@@ -90,3 +161,47 @@ async def get_ground_time(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to get ground time data: {str(e)}"
         )
+
+
+@router.get("/rotations", response_model=RotationsResponse)
+async def get_rotations(
+    request: Request,
+    planeIds: str = Query(..., description="Comma-separated list of plane IDs"),
+    startTime: str = Query(..., description="ISO 8601 start time"),
+    endTime: str = Query(..., description="ISO 8601 end time")
+):
+    """Get aircraft rotations (leg chains returning to base) with turnaround statistics"""
+    try:
+        # Parse comma-separated plane IDs
+        plane_id_list = [pid.strip() for pid in planeIds.split(',')]
+
+        if not plane_id_list:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one plane ID must be provided"
+            )
+
+        # Parse datetimes once; services work on parsed values
+        try:
+            start_dt = parse_timestamp(startTime)
+            end_dt = parse_timestamp(endTime)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid datetime format. Use ISO 8601 format"
+            )
+
+        # Trusted service output: skip response_model revalidation
+        return _cached_json_response(
+            request,
+            ('rotations', tuple(plane_id_list), start_dt, end_dt),
+            lambda: rotation_service.get_rotations_data(plane_id_list, start_dt, end_dt)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to get rotations data: {str(e)}"
+        )
@@ -9,6 +9,9 @@ from .flight import (
     PlaneGroundTime,
     GanttTripsResponse,
     GanttGroundTimeResponse,
+    Rotation,
+    PlaneRotations,
+    RotationsResponse,
 )
 
 __all__ = [
@@ -22,4 +25,7 @@ __all__ = [
     "PlaneGroundTime",
     "GanttTripsResponse",
     "GanttGroundTimeResponse",
+    "Rotation",
+    "PlaneRotations",
+    "RotationsResponse",
 ]
@@ -1,10 +1,14 @@
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import List, Optional, TypedDict
+from app.utils.timeutils import canonicalize_timestamp
 
 
 class Flight(TypedDict):
-    """Internal type for flight data as stored in CSV"""
+    """Internal type for flight data as stored in CSV
+
+    Timestamps are stored in canonical UTC form (``YYYY-MM-DDTHH:MM:SSZ``).
+    """
     id: str
     plane_id: str
     origin: str
@@ -14,6 +18,18 @@ class Flight(TypedDict):
     created_at: str
 
 
+class Leg(TypedDict):
+    """Internal type for a parsed flight leg in a plane's rotation structure"""
+    id: int
+    origin: str
+    destination: str
+    departure_time: str
+    arrival_time: str
+    departure: datetime
+    arrival: datetime
+    duration_minutes: int
+
+
 class FlightCreate(BaseModel):
     """Schema for creating a new flight"""
     planeId: str = Field(..., min_length=1, description="Plane identifier")
@@ -25,21 +41,16 @@ class FlightCreate(BaseModel):
     @field_validator('departureTime', 'arrivalTime')
     @classmethod
     def validate_datetime(cls, v: str) -> str:
-        """Validate ISO 8601 datetime format"""
-        try:
-            datetime.fromisoformat(v.replace('Z', '+00:00'))
-        except ValueError:
-            raise ValueError('Invalid ISO 8601 datetime format')
-        return v
+        """Validate ISO 8601 datetime format and normalize it to canonical UTC"""
+        return canonicalize_timestamp(v)
 
     @field_validator('arrivalTime')
     @classmethod
     def validate_arrival_after_departure(cls, v: str, info) -> str:
         """Validate that arrival is after departure"""
         if 'departureTime' in info.data:
-            departure = datetime.fromisoformat(info.data['departureTime'].replace('Z', '+00:00'))
-            arrival = datetime.fromisoformat(v.replace('Z', '+00:00'))
-            if arrival <= departure:
+            # Both values are canonical already, so string order is time order
+            if v <= info.data['departureTime']:
                 raise ValueError('Arrival time must be after departure time')
         return v
 
@@ -121,3 +132,34 @@ class GanttGroundTimeResponse(BaseModel):
     startTime: str
     endTime: str
     planes: List[PlaneGroundTime]
+
+
+class Rotation(BaseModel):
+    """Schema for an aircraft rotation: consecutive legs returning to base"""
+    base: str
+    route: str
+    flightIds: List[int]
+    startTime: str
+    endTime: str
+    complete: bool
+    legCount: int
+    blockMinutes: int
+    turnaroundCount: int
+    minTurnaroundMinutes: Optional[int] = None
+    avgTurnaroundMinutes: Optional[float] = None
+    maxTurnaroundMinutes: Optional[int] = None
+
+
+class PlaneRotations(BaseModel):
+    """Schema for rotations of a single plane"""
+    planeId: str
+    base: Optional[str] = None
+    rotations: List[Rotation]
+
+
+class RotationsResponse(BaseModel):
+    """Schema for rotations response"""
+    title: str
+    startTime: str
+    endTime: str
+    planes: List[PlaneRotations]
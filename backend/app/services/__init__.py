@@ -1,4 +1,5 @@
-from .flight_service import FlightService
+from .flight_service import FlightService, IngestState
 from .gantt_service import GanttService
+from .rotation_service import RotationService
 
-__all__ = ["FlightService", "GanttService"]
+__all__ = ["FlightService", "IngestState", "GanttService", "RotationService"]
@@ -1,9 +1,27 @@
 import csv
+import io
+import logging
 import os
-from datetime import datetime
-from typing import List, Optional, Dict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Set, Tuple
 from pathlib import Path
 from app.schemas.flight import Flight
+from app.utils.timeutils import format_timestamp, is_canonical_timestamp, parse_iso_utc
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+FIELDNAMES = [
+    'id', 'plane_id', 'origin', 'destination',
+    'departure_time', 'arrival_time', 'created_at'
+]
+TIMESTAMP_FIELDS = ('departure_time', 'arrival_time', 'created_at')
+
+logger = logging.getLogger(__name__)
 
 
 class FlightService:
@@ -14,16 +32,60 @@ class FlightService:
         self.data_file = Path(__file__).parent.parent.parent / data_file
         self.data_file.parent.mkdir(parents=True, exist_ok=True)
         self._ensure_file_exists()
+        with self.lock():
+            self._ensure_trailing_newline()
+        # Lookups compare canonical strings: migrate rows from older versions
+        if self._has_non_canonical_rows():
+            self.canonicalize_storage()
 
     def _ensure_file_exists(self):
         """Ensure the CSV file exists with headers"""
         if not self.data_file.exists():
             with open(self.data_file, 'w', newline='') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    'id', 'plane_id', 'origin', 'destination',
-                    'departure_time', 'arrival_time', 'created_at'
-                ])
+                writer.writerow(FIELDNAMES)
+
+    def _ensure_trailing_newline(self):
+        """Terminate a last row left without a newline (e.g. by hand editing)
+
+        Readers of appended rows only consume complete lines, and an append
+        would otherwise be glued onto the unterminated row. Call under lock().
+        """
+        with open(self.data_file, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\r\n')
+
+    @contextmanager
+    def lock(self):
+        """Hold the advisory write lock of the CSV file
+
+        Every writer takes it: API requests, the bulk loader and storage
+        migrations, in this or any other process. Duplicate checks and ID
+        assignment done under the lock see every row committed before it.
+        Not reentrant. Without fcntl (Windows) it does not lock.
+        """
+        lock_file = self.data_file.with_name(self.data_file.name + '.lock')
+        with open(lock_file, 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _has_non_canonical_rows(self) -> bool:
+        """Check whether any stored timestamp is not in canonical UTC form"""
+        with open(self.data_file, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                for field in TIMESTAMP_FIELDS:
+                    if not is_canonical_timestamp(row[field]):
+                        return True
+        return False
 
     def _get_next_id(self) -> int:
         """Get the next available ID"""
@@ -32,6 +94,45 @@ class FlightService:
             return 1
         return max(int(f['id']) for f in flights) + 1
 
+    def get_data_version(self) -> tuple:
+        """Get a token that changes whenever the CSV file changes"""
+        if not self.data_file.exists():
+            return (0, 0)
+        stat = self.data_file.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read_appended_flights(
+        self,
+        offset: int = 0,
+        tail: bytes = b''
+    ) -> Optional[Tuple[List[Flight], int, bytes]]:
+        """Read flights appended to the CSV file after a byte offset
+
+        ``tail`` is the last bytes before ``offset`` returned by the previous
+        call. Returns the new flights, the next offset and tail, or None when
+        the file was rewritten rather than appended to.
+        """
+        if not self.data_file.exists():
+            return None
+
+        with open(self.data_file, 'rb') as f:
+            if offset > 0:
+                f.seek(offset - len(tail))
+                if f.read(len(tail)) != tail:
+                    return None
+            data = f.read()
+
+        # Only consume complete lines
+        end = data.rfind(b'\n') + 1
+        flights: List[Flight] = []
+        for row in csv.reader(io.StringIO(data[:end].decode('utf-8'))):
+            if not row or row == FIELDNAMES:
+                continue
+            flights.append(dict(zip(FIELDNAMES, row)))
+
+        new_tail = (tail + data[:end])[-64:]
+        return flights, offset + end, new_tail
+
     def get_all_flights(self) -> List[Flight]:
         """Get all flights from CSV"""
         flights: List[Flight] = []
@@ -54,33 +155,32 @@ class FlightService:
 
     def create_flight(self, flight_data: Dict) -> Dict:
         """Create a new flight record"""
-        # Check for duplicate (same plane, same departure time)
-        existing_flights = self.get_flights_by_plane(flight_data['planeId'])
-        for flight in existing_flights:
-            if flight['departure_time'] == flight_data['departureTime']:
-                raise ValueError(f"Duplicate flight: plane {flight_data['planeId']} "
-                               f"already has a flight at {flight_data['departureTime']}")
+        with self.lock():
+            # Check for duplicate (same plane, same departure time)
+            existing_flights = self.get_flights_by_plane(flight_data['planeId'])
+            for flight in existing_flights:
+                if flight['departure_time'] == flight_data['departureTime']:
+                    raise ValueError(f"Duplicate flight: plane {flight_data['planeId']} "
+                                   f"already has a flight at {flight_data['departureTime']}")
 
-        flight_id = self._get_next_id()
-        created_at = datetime.utcnow().isoformat() + 'Z'
+            flight_id = self._get_next_id()
+            created_at = format_timestamp(datetime.now(timezone.utc))
 
-        flight = {
-            'id': flight_id,
-            'plane_id': flight_data['planeId'],
-            'origin': flight_data['origin'],
-            'destination': flight_data['destination'],
-            'departure_time': flight_data['departureTime'],
-            'arrival_time': flight_data['arrivalTime'],
-            'created_at': created_at
-        }
+            flight = {
+                'id': flight_id,
+                'plane_id': flight_data['planeId'],
+                'origin': flight_data['origin'],
+                'destination': flight_data['destination'],
+                'departure_time': flight_data['departureTime'],
+                'arrival_time': flight_data['arrivalTime'],
+                'created_at': created_at
+            }
 
-        # Append to CSV
-        with open(self.data_file, 'a', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'id', 'plane_id', 'origin', 'destination',
-                'departure_time', 'arrival_time', 'created_at'
-            ])
-            writer.writerow(flight)
+            # Append to CSV
+            self._ensure_trailing_newline()
+            with open(self.data_file, 'a', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writerow(flight)
 
         return {
             'id': flight_id,
@@ -92,45 +192,141 @@ class FlightService:
             'createdAt': created_at
         }
 
-    def get_flights_by_plane(self, plane_id: str) -> List[Flight]:
-        """Get all flights for a specific plane"""
-        flights = self.get_all_flights()
-        return [f for f in flights if f['plane_id'] == plane_id]
+    def append_flights(self, flights: List[Dict]):
+        """Append already validated and de-duplicated rows in a single write
 
-    def get_flights_by_plane_and_time_range(
-        self,
-        plane_ids: List[str],
-        start_time: str,
-        end_time: str
-    ) -> Dict[str, List[Flight]]:
-        """Get flights for multiple planes within a time range"""
-        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-
-        all_flights = self.get_all_flights()
-        result = {plane_id: [] for plane_id in plane_ids}
-
-        for flight in all_flights:
-            if flight['plane_id'] not in plane_ids:
-                continue
+        The caller holds lock() and checked the rows against an IngestState
+        synced under it.
+        """
+        self._ensure_trailing_newline()
+        with open(self.data_file, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writerows(flights)
+
+    def create_flights_bulk(self, flights_data: List[Dict]) -> Dict:
+        """Create many flight records with one read and one write
 
-            dept_dt = datetime.fromisoformat(flight['departure_time'].replace('Z', '+00:00'))
-            arr_dt = datetime.fromisoformat(flight['arrival_time'].replace('Z', '+00:00'))
+        Duplicates (same plane, same departure time) against stored flights
+        or earlier records of the same batch are reported as errors.
+        """
+        created_at = format_timestamp(datetime.now(timezone.utc))
+        rows = []
+        errors = []
+
+        with self.lock():
+            state = IngestState(self)
+            state.sync()
+            for idx, flight_data in enumerate(flights_data):
+                if not state.claim(flight_data['planeId'], flight_data['departureTime']):
+                    errors.append(f"Flight {idx + 1}: Duplicate flight: plane {flight_data['planeId']} "
+                                  f"already has a flight at {flight_data['departureTime']}")
+                    continue
+
+                rows.append({
+                    'id': state.next_id,
+                    'plane_id': flight_data['planeId'],
+                    'origin': flight_data['origin'],
+                    'destination': flight_data['destination'],
+                    'departure_time': flight_data['departureTime'],
+                    'arrival_time': flight_data['arrivalTime'],
+                    'created_at': created_at
+                })
+                state.next_id += 1
+
+            if rows:
+                self.append_flights(rows)
+
+        return {
+            "created": len(rows),
+            "failed": len(errors),
+            "errors": errors
+        }
 
-            # Include flight if it overlaps with the time range
-            if (start_dt <= dept_dt <= end_dt or
-                start_dt <= arr_dt <= end_dt or
-                (dept_dt < start_dt and arr_dt > end_dt)):
-                result[flight['plane_id']].append(flight)
+    def canonicalize_storage(self) -> int:
+        """Rewrite stored timestamps in canonical UTC form
 
-        # Sort flights by departure time for each plane
-        for plane_id in result:
-            result[plane_id].sort(key=lambda x: x['departure_time'])
+        Returns the number of rows that changed. Runs automatically when the
+        service opens a file written before timestamps were normalized at
+        ingest, or edited by hand since. Sub-second parts, which ingest now
+        rejects, are truncated with a warning naming the affected flights.
+        """
+        with self.lock():
+            flights = self.get_all_flights()
+            changed = 0
+            truncated = []
+            for flight in flights:
+                row_changed = False
+                for field in TIMESTAMP_FIELDS:
+                    if is_canonical_timestamp(flight[field]):
+                        continue
+                    try:
+                        dt = parse_iso_utc(flight[field])
+                    except ValueError:
+                        # Leave unparsable values for the operator to fix
+                        continue
+                    if dt.microsecond and flight['id'] not in truncated:
+                        truncated.append(flight['id'])
+                    canonical = format_timestamp(dt)
+                    if canonical != flight[field]:
+                        flight[field] = canonical
+                        row_changed = True
+                changed += row_changed
 
-        return result
+            if changed:
+                tmp_file = self.data_file.with_name(self.data_file.name + '.tmp')
+                with open(tmp_file, 'w', newline='') as f:
+                    writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                    writer.writeheader()
+                    writer.writerows(flights)
+                os.replace(tmp_file, self.data_file)
+            if truncated:
+                logger.warning("Truncated sub-second timestamps of %d flight(s) in %s to whole "
+                               "seconds: ids %s", len(truncated), self.data_file, ', '.join(truncated))
+            return changed
+
+    def get_flights_by_plane(self, plane_id: str) -> List[Flight]:
+        """Get all flights for a specific plane"""
+        flights = self.get_all_flights()
+        return [f for f in flights if f['plane_id'] == plane_id]
 
     def get_all_plane_ids(self) -> List[str]:
         """Get list of all unique plane IDs"""
         flights = self.get_all_flights()
         plane_ids = set(f['plane_id'] for f in flights)
         return sorted(list(plane_ids))
+
+
+class IngestState:
+    """Next free ID and departure times taken per plane, synced with the CSV file
+
+    Each sync reads only the rows appended since the previous one, so a
+    long import can re-sync cheaply before every batch it writes.
+    """
+
+    def __init__(self, flight_service: FlightService):
+        self.flight_service = flight_service
+        self.next_id = 1
+        self.departures: Dict[str, Set[str]] = {}
+        self._offset = 0
+        self._tail = b''
+
+    def sync(self):
+        """Take in rows written since the last sync, by any writer"""
+        appended = self.flight_service.read_appended_flights(self._offset, self._tail)
+        if appended is None:
+            # File was rewritten: start over
+            self.next_id = 1
+            self.departures = {}
+            appended = self.flight_service.read_appended_flights() or ([], 0, b'')
+        flights, self._offset, self._tail = appended
+        for flight in flights:
+            self.next_id = max(self.next_id, int(flight['id']) + 1)
+            self.departures.setdefault(flight['plane_id'], set()).add(flight['departure_time'])
+
+    def claim(self, plane_id: str, departure_time: str) -> bool:
+        """Reserve a plane's departure time; False if it is already taken"""
+        plane_departures = self.departures.setdefault(plane_id, set())
+        if departure_time in plane_departures:
+            return False
+        plane_departures.add(departure_time)
+        return True
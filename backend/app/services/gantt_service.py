@@ -1,50 +1,47 @@
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .flight_service import FlightService
-from app.schemas.flight import Flight
+from .rotation_service import RotationService
+from app.schemas.flight import Leg
+from app.utils.timeutils import format_timestamp
 
 
 class GanttService:
     """Service for generating Gantt chart data"""
 
-    def __init__(self, flight_service: FlightService):
+    def __init__(self, flight_service: FlightService, rotation_service: Optional[RotationService] = None):
         self.flight_service = flight_service
+        self.rotation_service = rotation_service or RotationService(flight_service)
 
-    def _calculate_duration_minutes(self, start_time: str, end_time: str) -> int:
-        """Calculate duration in minutes between two ISO timestamps"""
-        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+    def _calculate_duration_minutes(self, start_dt: datetime, end_dt: datetime) -> int:
+        """Calculate duration in minutes between two datetimes"""
         duration = (end_dt - start_dt).total_seconds() / 60
         return int(duration)
 
     def get_trips_data(
         self,
         plane_ids: List[str],
-        start_time: str,
-        end_time: str
+        start_dt: datetime,
+        end_dt: datetime
     ) -> Dict:
         """Generate trip schedule data for Gantt chart"""
-        flights_by_plane: Dict[str, List[Flight]] = self.flight_service.get_flights_by_plane_and_time_range(
-            plane_ids, start_time, end_time
-        )
+        start_time = format_timestamp(start_dt)
+        end_time = format_timestamp(end_dt)
 
         planes_data = []
         for plane_id in plane_ids:
-            flights: List[Flight] = flights_by_plane.get(plane_id, [])
+            flights: List[Leg] = self.rotation_service.get_legs(plane_id, start_dt, end_dt)
             trips = []
 
             for flight in flights:
                 trip = {
-                    "id": int(flight['id']),
+                    "id": flight['id'],
                     "route": f"{flight['origin']}-{flight['destination']}",
                     "origin": flight['origin'],
                     "destination": flight['destination'],
                     "startTime": flight['departure_time'],
                     "endTime": flight['arrival_time'],
-                    "durationMinutes": self._calculate_duration_minutes(
-                        flight['departure_time'],
-                        flight['arrival_time']
-                    )
+                    "durationMinutes": flight['duration_minutes']
                 }
                 trips.append(trip)
 
@@ -55,8 +52,8 @@ class GanttService:
 
         # Create title
         plane_names = ', '.join(plane_ids)
-        start_date = datetime.fromisoformat(start_time.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-        end_date = datetime.fromisoformat(end_time.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+        start_date = start_dt.strftime('%Y-%m-%d')
+        end_date = end_dt.strftime('%Y-%m-%d')
         title = f"Trips of {plane_names} from {start_date} to {end_date}"
 
         return {
@@ -69,20 +66,16 @@ class GanttService:
     def get_ground_time_data(
         self,
         plane_ids: List[str],
-        start_time: str,
-        end_time: str
+        start_dt: datetime,
+        end_dt: datetime
     ) -> Dict:
         """Generate ground time schedule data for Gantt chart"""
-        flights_by_plane: Dict[str, List[Flight]] = self.flight_service.get_flights_by_plane_and_time_range(
-            plane_ids, start_time, end_time
-        )
-
-        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+        start_time = format_timestamp(start_dt)
+        end_time = format_timestamp(end_dt)
 
         planes_data = []
         for plane_id in plane_ids:
-            flights: List[Flight] = flights_by_plane.get(plane_id, [])
+            flights: List[Leg] = self.rotation_service.get_legs(plane_id, start_dt, end_dt)
             ground_periods = []
 
             if not flights:
@@ -91,18 +84,15 @@ class GanttService:
                 continue
 
             # Ground time before first flight
-            first_flight_dept = datetime.fromisoformat(
-                flights[0]['departure_time'].replace('Z', '+00:00')
-            )
-            if first_flight_dept > start_dt:
+            if flights[0]['departure'] > start_dt:
                 # Location is the origin of the first flight
                 ground_periods.append({
                     "location": flights[0]['origin'],
                     "startTime": start_time,
                     "endTime": flights[0]['departure_time'],
                     "durationMinutes": self._calculate_duration_minutes(
-                        start_time,
-                        flights[0]['departure_time']
+                        start_dt,
+                        flights[0]['departure']
                     )
                 })
 
@@ -122,23 +112,20 @@ class GanttService:
                         "startTime": ground_start,
                         "endTime": ground_end,
                         "durationMinutes": self._calculate_duration_minutes(
-                            ground_start,
-                            ground_end
+                            current_flight['arrival'],
+                            next_flight['departure']
                         )
                     })
 
             # Ground time after last flight
-            last_flight_arr = datetime.fromisoformat(
-                flights[-1]['arrival_time'].replace('Z', '+00:00')
-            )
-            if last_flight_arr < end_dt:
+            if flights[-1]['arrival'] < end_dt:
                 ground_periods.append({
                     "location": flights[-1]['destination'],
                     "startTime": flights[-1]['arrival_time'],
                     "endTime": end_time,
                     "durationMinutes": self._calculate_duration_minutes(
-                        flights[-1]['arrival_time'],
-                        end_time
+                        flights[-1]['arrival'],
+                        end_dt
                     )
                 })
 
@@ -149,8 +136,8 @@ class GanttService:
 
         # Create title
         plane_names = ', '.join(plane_ids)
-        start_date = datetime.fromisoformat(start_time.replace('Z', '+00:00')).strftime('%Y-%m-%d')
-        end_date = datetime.fromisoformat(end_time.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+        start_date = start_dt.strftime('%Y-%m-%d')
+        end_date = end_dt.strftime('%Y-%m-%d')
         title = f"Ground time of {plane_names} from {start_date} to {end_date}"
 
         return {
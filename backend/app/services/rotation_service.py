@@ -0,0 +1,263 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from .flight_service import FlightService
+from app.schemas.flight import Flight, Leg
+from app.utils.timeutils import format_timestamp, parse_iso_utc
+
+# Above this many new legs for one plane, re-sorting the plane beats splicing
+SPLICE_LIMIT = 64
+
+
+def _leg_key(leg: Leg) -> tuple:
+    """Ordering key of a leg: departure time, then flight id"""
+    return (leg['departure'], leg['id'])
+
+
+def _parse_leg(flight: Flight) -> Leg:
+    """Parse a stored flight row into a leg"""
+    # Each stored row is parsed once, so the request parse cache is bypassed
+    departure = parse_iso_utc(flight['departure_time'])
+    arrival = parse_iso_utc(flight['arrival_time'])
+    return {
+        'id': int(flight['id']),
+        'origin': flight['origin'],
+        'destination': flight['destination'],
+        'departure_time': flight['departure_time'],
+        'arrival_time': flight['arrival_time'],
+        'departure': departure,
+        'arrival': arrival,
+        'duration_minutes': int((arrival - departure).total_seconds() / 60)
+    }
+
+
+def _build_rotation(legs: List[Leg], base: str, complete: bool) -> Dict:
+    """Build a rotation with its block time and turnaround statistics"""
+    turnarounds = [
+        int((legs[i + 1]['departure'] - legs[i]['arrival']).total_seconds() / 60)
+        for i in range(len(legs) - 1)
+    ]
+    return {
+        'legs': legs,
+        'base': base,
+        'complete': complete,
+        'block_minutes': sum(leg['duration_minutes'] for leg in legs),
+        'turnarounds': turnarounds
+    }
+
+
+def _chain_rotations(legs: List[Leg], base: str) -> List[Dict]:
+    """Split ordered legs into rotations, each ending on arrival at base"""
+    rotations = []
+    current: List[Leg] = []
+    for leg in legs:
+        current.append(leg)
+        if leg['destination'] == base:
+            rotations.append(_build_rotation(current, base, True))
+            current = []
+    if current:
+        # Trailing legs that have not returned to base yet
+        rotations.append(_build_rotation(current, base, False))
+    return rotations
+
+
+class _PlaneChain:
+    """Ordered legs and rotations of a single plane"""
+
+    def __init__(self):
+        self.keys: List[tuple] = []
+        self.legs: List[Leg] = []
+        self.rotations: List[Dict] = []
+        self.rotation_keys: List[tuple] = []
+        self.max_duration = timedelta(0)
+        # Upper bound on the span of any rotation, for range lookups
+        self.max_rotation_span = timedelta(0)
+
+    @property
+    def base(self) -> Optional[str]:
+        """Home base: origin of the plane's first leg"""
+        return self.legs[0]['origin'] if self.legs else None
+
+    def _set_rotations(self, start: int, end: int, rotations: List[Dict]):
+        self.rotations[start:end] = rotations
+        self.rotation_keys[start:end] = [_leg_key(r['legs'][0]) for r in rotations]
+        for rotation in rotations:
+            span = rotation['legs'][-1]['arrival'] - rotation['legs'][0]['departure']
+            self.max_rotation_span = max(self.max_rotation_span, span)
+
+    def _reset_rotations(self):
+        """Re-chain every rotation of the plane"""
+        self.rotations = []
+        self.rotation_keys = []
+        self.max_rotation_span = timedelta(0)
+        self._set_rotations(0, 0, _chain_rotations(self.legs, self.base))
+
+    def rebuild(self, new_legs: List[Leg]):
+        """Merge new legs and recompute all rotations of the plane"""
+        self.legs.extend(new_legs)
+        self.legs.sort(key=_leg_key)
+        self.keys = [_leg_key(leg) for leg in self.legs]
+        for leg in new_legs:
+            self.max_duration = max(self.max_duration, leg['arrival'] - leg['departure'])
+        self._reset_rotations()
+
+    def splice(self, leg: Leg):
+        """Insert a leg and re-chain only the rotations it touches"""
+        key = _leg_key(leg)
+        pos = bisect_right(self.keys, key)
+        self.keys.insert(pos, key)
+        self.legs.insert(pos, leg)
+        self.max_duration = max(self.max_duration, leg['arrival'] - leg['departure'])
+
+        if pos == 0:
+            # A new first leg may move the home base
+            self._reset_rotations()
+            return
+
+        base = self.base
+        start = max(0, bisect_right(self.rotation_keys, key) - 1)
+        segment = list(self.rotations[start]['legs'])
+        insort(segment, leg, key=_leg_key)
+        end = start + 1
+        rotations = _chain_rotations(segment, base)
+
+        # An open rotation absorbs the following one until it returns to base
+        while not rotations[-1]['complete'] and end < len(self.rotations):
+            segment = rotations[-1]['legs'] + self.rotations[end]['legs']
+            end += 1
+            rotations = rotations[:-1] + _chain_rotations(segment, base)
+
+        self._set_rotations(start, end, rotations)
+
+    def legs_in_range(self, start_dt: datetime, end_dt: datetime) -> List[Leg]:
+        """Get legs overlapping a time range, ordered by departure"""
+        lo = bisect_left(self.keys, (start_dt - self.max_duration,))
+        hi = bisect_right(self.keys, (end_dt, float('inf')))
+        return [leg for leg in self.legs[lo:hi] if leg['arrival'] >= start_dt]
+
+    def rotations_in_range(self, start_dt: datetime, end_dt: datetime) -> List[Dict]:
+        """Get rotations overlapping a time range"""
+        lo = bisect_left(self.rotation_keys, (start_dt - self.max_rotation_span,))
+        hi = bisect_right(self.rotation_keys, (end_dt, float('inf')))
+        return [r for r in self.rotations[lo:hi] if r['legs'][-1]['arrival'] >= start_dt]
+
+
+class RotationService:
+    """Materialized per-plane flight sequences and aircraft rotations
+
+    Flights are parsed once and kept ordered per plane. New rows appended to
+    the CSV file are spliced into their plane; only a rewritten file causes
+    a full rebuild.
+    """
+
+    def __init__(self, flight_service: FlightService):
+        self.flight_service = flight_service
+        self._chains: Dict[str, _PlaneChain] = {}
+        self._version = None
+        self._offset = 0
+        self._tail = b''
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Bring the materialized structure up to date with the CSV file"""
+        version = self.flight_service.get_data_version()
+        if version == self._version:
+            return
+
+        with self._lock:
+            if version == self._version:
+                return
+
+            appended = self.flight_service.read_appended_flights(self._offset, self._tail)
+            if appended is None:
+                # File was rewritten: start over
+                self._chains = {}
+                appended = self.flight_service.read_appended_flights() or ([], 0, b'')
+            flights, self._offset, self._tail = appended
+
+            new_legs: Dict[str, List[Leg]] = {}
+            for flight in flights:
+                new_legs.setdefault(flight['plane_id'], []).append(_parse_leg(flight))
+
+            for plane_id, legs in new_legs.items():
+                chain = self._chains.setdefault(plane_id, _PlaneChain())
+                if not chain.legs or len(legs) > SPLICE_LIMIT:
+                    chain.rebuild(legs)
+                else:
+                    for leg in legs:
+                        chain.splice(leg)
+
+            self._version = version
+
+    def get_legs(self, plane_id: str, start_dt: datetime, end_dt: datetime) -> List[Leg]:
+        """Get a plane's legs overlapping a time range, ordered by departure"""
+        self.refresh()
+        chain = self._chains.get(plane_id)
+        if chain is None:
+            return []
+        return chain.legs_in_range(start_dt, end_dt)
+
+    def get_rotations(self, plane_id: str, start_dt: datetime, end_dt: datetime) -> List[Dict]:
+        """Get a plane's rotations overlapping a time range"""
+        self.refresh()
+        chain = self._chains.get(plane_id)
+        if chain is None:
+            return []
+        return chain.rotations_in_range(start_dt, end_dt)
+
+    def get_base(self, plane_id: str) -> Optional[str]:
+        """Get a plane's home base"""
+        self.refresh()
+        chain = self._chains.get(plane_id)
+        return chain.base if chain is not None else None
+
+    def get_rotations_data(
+        self,
+        plane_ids: List[str],
+        start_dt: datetime,
+        end_dt: datetime
+    ) -> Dict:
+        """Generate rotation data for multiple planes"""
+        start_time = format_timestamp(start_dt)
+        end_time = format_timestamp(end_dt)
+
+        planes_data = []
+        for plane_id in plane_ids:
+            rotations = []
+            for rotation in self.get_rotations(plane_id, start_dt, end_dt):
+                legs = rotation['legs']
+                turnarounds = rotation['turnarounds']
+                rotations.append({
+                    "base": rotation['base'],
+                    "route": '-'.join([legs[0]['origin']] + [leg['destination'] for leg in legs]),
+                    "flightIds": [leg['id'] for leg in legs],
+                    "startTime": legs[0]['departure_time'],
+                    "endTime": legs[-1]['arrival_time'],
+                    "complete": rotation['complete'],
+                    "legCount": len(legs),
+                    "blockMinutes": rotation['block_minutes'],
+                    "turnaroundCount": len(turnarounds),
+                    "minTurnaroundMinutes": min(turnarounds) if turnarounds else None,
+                    "avgTurnaroundMinutes": (
+                        round(sum(turnarounds) / len(turnarounds), 1) if turnarounds else None
+                    ),
+                    "maxTurnaroundMinutes": max(turnarounds) if turnarounds else None
+                })
+
+            planes_data.append({
+                "planeId": plane_id,
+                "base": self.get_base(plane_id),
+                "rotations": rotations
+            })
+
+        # Create title
+        plane_names = ', '.join(plane_ids)
+        title = f"Rotations of {plane_names} from {start_dt.strftime('%Y-%m-%d')} to {end_dt.strftime('%Y-%m-%d')}"
+
+        return {
+            "title": title,
+            "startTime": start_time,
+            "endTime": end_time,
+            "planes": planes_data
+        }
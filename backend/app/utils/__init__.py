@@ -0,0 +1,21 @@
+from .profiling import ProfileStore, ProfilingMiddleware, profile_store
+from .compression import CompressionMiddleware, PayloadCache, negotiate_encoding
+from .timeutils import canonicalize_timestamp, format_timestamp, is_canonical_timestamp, parse_timestamp
+from .serialization import FastJSONResponse, dumps, parse_fields, project_items
+
+__all__ = [
+    "ProfileStore",
+    "ProfilingMiddleware",
+    "profile_store",
+    "CompressionMiddleware",
+    "PayloadCache",
+    "negotiate_encoding",
+    "canonicalize_timestamp",
+    "format_timestamp",
+    "is_canonical_timestamp",
+    "parse_timestamp",
+    "FastJSONResponse",
+    "dumps",
+    "parse_fields",
+    "project_items",
+]
@@ -0,0 +1,295 @@
+import gzip
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Responses smaller than this are not worth compressing
+MIN_SIZE_ENV = "COMPRESSION_MIN_SIZE"
+DEFAULT_MIN_SIZE = 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# Server preference when the client accepts several encodings equally
+_PREFERENCE = ["zstd", "br", "gzip"]
+_LEVELS = {"zstd": 3, "br": 5, "gzip": 6}
+
+
+def get_min_size() -> int:
+    """Get the configured compression size threshold"""
+    return int(os.environ.get(MIN_SIZE_ENV, DEFAULT_MIN_SIZE))
+
+
+def available_encodings() -> list:
+    """Get the content encodings supported in this environment"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip() != 'q':
+                continue
+            try:
+                quality = float(value.strip())
+            except ValueError:
+                quality = 0.0
+        qualities[name] = quality
+
+    best = None
+    best_quality = 0.0
+    for encoding in available_encodings():
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a complete body with the given encoding"""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=_LEVELS["zstd"]).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=_LEVELS["br"])
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=_LEVELS["gzip"], mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class StreamCompressor:
+    """Incremental compressor for streaming responses"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=_LEVELS["zstd"]).compressobj()
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=_LEVELS["br"])
+        elif encoding == "gzip":
+            self._compressor = zlib.compressobj(_LEVELS["gzip"], zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away"""
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        if self.encoding == "zstd":
+            return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Finish the compressed stream"""
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+class PayloadCache:
+    """LRU cache of response bodies and their compressed variants
+
+    Entries belong to one data version; storing a body for a new version
+    drops everything cached for the previous one. Both the number of entries
+    and the total size of all stored copies are bounded.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Dict[Optional[str], bytes]]" = OrderedDict()
+        self._version: Hashable = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all cached copies"""
+        return self._bytes
+
+    def _evict(self):
+        """Drop least recently used entries until within both limits"""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= sum(len(copy) for copy in entry.values())
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[bytes]:
+        """Get the uncompressed body for a key at the given data version"""
+        with self._lock:
+            if version != self._version:
+                return None
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[None]
+
+    def put(self, key: Hashable, version: Hashable, body: bytes):
+        """Store an uncompressed body, evicting least recently used entries"""
+        with self._lock:
+            if version != self._version:
+                # Data changed: nothing cached for the old version is valid
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._bytes -= sum(len(copy) for copy in old_entry.values())
+            if len(body) > self.max_bytes:
+                return
+
+            self._entries[key] = {None: body}
+            self._bytes += len(body)
+            self._evict()
+
+    def get_encoded(self, key: Hashable, version: Hashable, body: bytes, encoding: str) -> bytes:
+        """Get a compressed variant of a cached body, compressing it once"""
+        with self._lock:
+            entry = self._entries.get(key) if version == self._version else None
+            if entry is not None and encoding in entry:
+                return entry[encoding]
+
+        encoded = compress(body, encoding)
+
+        with self._lock:
+            entry = self._entries.get(key) if version == self._version else None
+            if entry is not None and entry[None] is body and encoding not in entry:
+                entry[encoding] = encoded
+                self._bytes += len(encoded)
+                self._entries.move_to_end(key)
+                self._evict()
+        return encoded
+
+    def clear(self):
+        """Drop all cached payloads"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class CompressionMiddleware:
+    """Negotiate Content-Encoding for JSON and text responses
+
+    Bodies below the size threshold are sent as-is. Streaming responses are
+    compressed chunk by chunk. Responses that already carry a
+    Content-Encoding (such as cached Gantt payloads) pass through untouched.
+    """
+
+    def __init__(self, app, min_size: Optional[int] = None):
+        self.app = app
+        self.min_size = get_min_size() if min_size is None else min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.min_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Wrap the ASGI send channel of a single response"""
+
+    def __init__(self, send, encoding: str, min_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.min_size = min_size
+        self.start_message = None
+        self.passthrough = False
+        self.compressor: Optional[StreamCompressor] = None
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            if self.start_message is not None:
+                await self._send(self.start_message)
+                self.start_message = None
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not more_body and len(body) < self.min_size:
+                # Small complete body: send uncompressed
+                headers.add_vary_header("Accept-Encoding")
+                await self._send(self.start_message)
+                self.start_message = None
+                await self._send(message)
+                self.passthrough = True
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self._send(self.start_message)
+                self.start_message = None
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+            # Streaming response: compress incrementally
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            self.compressor = StreamCompressor(self.encoding)
+            await self._send(self.start_message)
+            self.start_message = None
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,156 @@
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from .timeutils import format_timestamp
+
+# Profiling is disabled unless an admin token is configured
+ADMIN_TOKEN_ENV = "PROFILING_ADMIN_TOKEN"
+MAX_PROFILES_ENV = "PROFILING_MAX_PROFILES"
+DEFAULT_MAX_PROFILES = 50
+
+
+def get_admin_token() -> Optional[str]:
+    """Get the configured profiling admin token, if any"""
+    return os.environ.get(ADMIN_TOKEN_ENV) or None
+
+
+def is_admin_request(request: Request) -> bool:
+    """Check whether the request carries a valid admin token"""
+    token = get_admin_token()
+    if token is None:
+        return False
+    # Compare bytes: compare_digest rejects non-ASCII str
+    return hmac.compare_digest(
+        request.headers.get("X-Admin-Token", "").encode(),
+        token.encode()
+    )
+
+
+class ProfileStore:
+    """Bounded on-disk ring of pstats profiles"""
+
+    def __init__(self, profile_dir: str = "data/profiles", max_profiles: Optional[int] = None):
+        """Initialize the profile store in the given directory"""
+        self.profile_dir = Path(__file__).parent.parent.parent / profile_dir
+        if max_profiles is None:
+            max_profiles = int(os.environ.get(MAX_PROFILES_ENV, DEFAULT_MAX_PROFILES))
+        self.max_profiles = max(1, max_profiles)
+        self._lock = threading.Lock()
+
+    def _profile_files(self) -> List[Path]:
+        """Get stored profile files, oldest first"""
+        if not self.profile_dir.exists():
+            return []
+        return sorted(self.profile_dir.glob("*.pstats"))
+
+    def save(self, profiler: cProfile.Profile, method: str, path: str, duration_ms: float) -> str:
+        """Store a profile and evict the oldest ones beyond the ring size"""
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')
+        slug = path.strip('/').replace('/', '_') or 'root'
+        profile_id = f"{timestamp}_{method.lower()}_{slug}_{round(duration_ms)}ms"
+
+        with self._lock:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(self.profile_dir / f"{profile_id}.pstats"))
+
+            files = self._profile_files()
+            for old_file in files[:max(0, len(files) - self.max_profiles)]:
+                old_file.unlink(missing_ok=True)
+
+        return profile_id
+
+    def list_profiles(self) -> List[Dict]:
+        """List stored profiles, newest first"""
+        profiles = []
+        for profile_file in reversed(self._profile_files()):
+            stat = profile_file.stat()
+            profiles.append({
+                "id": profile_file.stem,
+                "sizeBytes": stat.st_size,
+                "createdAt": format_timestamp(datetime.fromtimestamp(stat.st_mtime, timezone.utc))
+            })
+        return profiles
+
+    def get_path(self, profile_id: str) -> Optional[Path]:
+        """Get the file path of a stored profile"""
+        # Profile ids never contain path separators
+        if '/' in profile_id or '\\' in profile_id or profile_id.startswith('.'):
+            return None
+        profile_file = self.profile_dir / f"{profile_id}.pstats"
+        if not profile_file.exists():
+            return None
+        return profile_file
+
+    def render_text(self, profile_id: str, sort: str = "cumulative", limit: int = 100) -> Optional[str]:
+        """Render a stored profile as a pstats text report"""
+        profile_file = self.get_path(profile_id)
+        if profile_file is None:
+            return None
+        output = io.StringIO()
+        stats = pstats.Stats(str(profile_file), stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+profile_store = ProfileStore()
+
+# cProfile only supports one active profiler at a time
+_profiler_lock = threading.Lock()
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Run a single request under cProfile when an admin asks for it
+
+    Profiling is requested with the ``profile=1`` query parameter or the
+    ``X-Profile: 1`` header, together with a valid ``X-Admin-Token``.
+    """
+
+    def __init__(self, app, store: ProfileStore = profile_store):
+        super().__init__(app)
+        self.store = store
+
+    @staticmethod
+    def _wants_profile(request: Request) -> bool:
+        """Check whether the request asks to be profiled"""
+        flag = request.query_params.get("profile") or request.headers.get("X-Profile")
+        return flag in ("1", "true", "yes")
+
+    async def dispatch(self, request: Request, call_next):
+        if not self._wants_profile(request) or not is_admin_request(request):
+            return await call_next(request)
+
+        # Another request is being profiled; serve this one normally
+        if not _profiler_lock.acquire(blocking=False):
+            response = await call_next(request)
+            response.headers["X-Profile-Skipped"] = "busy"
+            return response
+
+        # Routes skip their payload caches for profiled requests
+        request.state.profiling = True
+
+        try:
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+            profile_id = self.store.save(profiler, request.method, request.url.path, duration_ms)
+        finally:
+            _profiler_lock.release()
+
+        response.headers["X-Profile-Id"] = profile_id
+        return response
@@ -0,0 +1,58 @@
+import json
+from typing import Dict, List, Optional, Set
+
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(data) -> bytes:
+    """Encode trusted, JSON-native data straight to bytes"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(Response):
+    """JSON response for trusted internal data
+
+    Returning a Response from a route makes FastAPI skip ``response_model``
+    validation and its ``jsonable_encoder`` pass, while the declared model
+    still documents the endpoint in the OpenAPI schema.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(fields: Optional[str], allowed: Set[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ``fields`` projection
+
+    Raises ValueError for unknown field names or when no names are given.
+    """
+    if not fields:
+        return None
+    field_list = [field.strip() for field in fields.split(',') if field.strip()]
+    if not field_list:
+        raise ValueError("At least one field name must be provided")
+    unknown = [field for field in field_list if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. "
+                         f"Allowed fields: {', '.join(sorted(allowed))}")
+    return field_list
+
+
+def project_items(data: Dict, items_key: str, fields: Optional[List[str]]) -> Dict:
+    """Keep only the given fields in each plane's nested items"""
+    if fields is None:
+        return data
+    for plane in data['planes']:
+        plane[items_key] = [
+            {field: item[field] for field in fields if field in item}
+            for item in plane[items_key]
+        ]
+    return data
@@ -0,0 +1,53 @@
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+
+# Canonical storage form: fixed-width UTC with second precision, so that
+# string order is chronological order
+CANONICAL_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+_CANONICAL_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z')
+
+
+def parse_iso_utc(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp into an aware UTC datetime
+
+    Timestamps without an offset are taken to be UTC. Raises ValueError for
+    invalid input.
+    """
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+# Request windows repeat a lot (presets, polling): keep recent parses.
+# Ingested values are mostly unique, so they go through parse_iso_utc
+# rather than evicting the request windows.
+parse_timestamp = lru_cache(maxsize=4096)(parse_iso_utc)
+
+
+def format_timestamp(dt: datetime) -> str:
+    """Format a datetime in canonical UTC form, dropping any sub-second part"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime(CANONICAL_FORMAT)
+
+
+def canonicalize_timestamp(value: str) -> str:
+    """Normalize an ISO 8601 timestamp to canonical UTC form
+
+    Raises ValueError for invalid input, and for sub-second values that the
+    canonical form cannot represent (a zero fraction such as ``.000`` is fine).
+    """
+    try:
+        dt = parse_iso_utc(value)
+    except ValueError:
+        raise ValueError('Invalid ISO 8601 datetime format')
+    if dt.microsecond:
+        raise ValueError('Sub-second precision is not supported')
+    return format_timestamp(dt)
+
+
+def is_canonical_timestamp(value: str) -> bool:
+    """Check whether a timestamp is already in canonical UTC form"""
+    return _CANONICAL_RE.fullmatch(value) is not None
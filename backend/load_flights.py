@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for flight data
+
+Imports flights from JSON, NDJSON or CSV files, validating records in a
+process pool and writing them through the batched ingest path, and exports
+stored flights back out in the same formats.
+
+Each batch is written under the data file's advisory lock, after catching
+up with rows the API (or another import) wrote meanwhile, so the server
+can keep accepting flights during an import.
+
+Examples:
+    python load_flights.py import sample_data.json
+    python load_flights.py import flights.ndjson --workers 8 --batch-size 50000
+    python load_flights.py import flights.csv --dry-run
+    python load_flights.py import flights.csv --resume
+    python load_flights.py export flights.ndjson --plane-id PLANE_A
+    python load_flights.py canonicalize
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pydantic import ValidationError
+from app.schemas import FlightCreate
+from app.services import FlightService, IngestState
+from app.utils.timeutils import format_timestamp
+
+FORMATS = ("json", "ndjson", "csv")
+API_FIELDS = ["planeId", "origin", "destination", "departureTime", "arrivalTime"]
+
+# CSV files may use either the API or the storage column names
+CSV_ALIASES = {
+    "plane_id": "planeId",
+    "departure_time": "departureTime",
+    "arrival_time": "arrivalTime",
+}
+
+
+def detect_format(path: Path, fmt: Optional[str]) -> str:
+    """Get the file format from the --format option or the file extension"""
+    if fmt:
+        return fmt
+    suffix = path.suffix.lower().lstrip('.')
+    if suffix == "jsonl":
+        return "ndjson"
+    if suffix in FORMATS:
+        return suffix
+    raise ValueError(f"Cannot detect format of {path}. Use --format {{{','.join(FORMATS)}}}")
+
+
+class InvalidRecord:
+    """Placeholder for an input record that could not be decoded"""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def read_records(path: Path, fmt: str) -> Iterator[Dict]:
+    """Yield raw flight records from an input file
+
+    Undecodable NDJSON lines are yielded as InvalidRecord so they count as
+    failed records and keep the record numbering of resumed imports stable.
+    """
+    if fmt == "json":
+        with open(path, 'r') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} is not valid JSON: {e}")
+        if isinstance(data, dict) and isinstance(data.get("flights"), list):
+            data = data["flights"]
+        if not isinstance(data, list):
+            raise ValueError(f"{path} must contain a JSON list of flights "
+                             f"or an object with a \"flights\" list")
+        yield from data
+    elif fmt == "ndjson":
+        with open(path, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield InvalidRecord(f"line {line_number}: invalid JSON: {e}")
+    else:
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                yield {CSV_ALIASES.get(key, key): value for key, value in row.items()}
+
+
+def validate_chunk(chunk: List[Tuple[int, Dict]]) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Validate a chunk of numbered records (runs in a worker process)"""
+    results = []
+    for idx, record in chunk:
+        if isinstance(record, InvalidRecord):
+            results.append((idx, None, record.message))
+            continue
+        try:
+            flight = FlightCreate.model_validate(record)
+            results.append((idx, flight.model_dump(), None))
+        except ValidationError as e:
+            messages = '; '.join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            results.append((idx, None, messages))
+        except Exception as e:
+            results.append((idx, None, str(e)))
+    return results
+
+
+def chunked(iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validated_chunks(records: Iterator[Tuple[int, Dict]], workers: int, chunk_size: int):
+    """Validate records in a process pool, yielding results in input order"""
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield validate_chunk(chunk)
+        return
+
+    # Keep a bounded number of chunks in flight so memory stays flat
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(validate_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+class Checkpoint:
+    """Number of input records already committed to a data file, for resuming an import"""
+
+    def __init__(self, path: Path, data_file: Path):
+        self.path = path
+        self.data_file = str(data_file.resolve())
+
+    def load(self) -> int:
+        if not self.path.exists():
+            return 0
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if data.get("dataFile") != self.data_file:
+            raise ValueError(f"Checkpoint {self.path} belongs to data file {data.get('dataFile')}, "
+                             f"not {self.data_file}. Use the same --data-file or remove the checkpoint")
+        return int(data.get("processed", 0))
+
+    def save(self, processed: int):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "processed": processed,
+                "dataFile": self.data_file,
+                "updatedAt": format_timestamp(datetime.now(timezone.utc))
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+
+class Progress:
+    """Periodic progress and throughput reporting"""
+
+    def __init__(self, interval: float = 1.0, quiet: bool = False):
+        self.started = time.perf_counter()
+        self.last_report = 0.0
+        self.interval = interval
+        self.quiet = quiet
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def rate(self, processed: int) -> float:
+        return processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self, processed: int, created: int, failed: int, force: bool = False):
+        if self.quiet:
+            return
+        now = self.elapsed
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        print(f"  {processed:>12,} processed  {created:>12,} created  {failed:>10,} failed  "
+              f"{self.rate(processed):>12,.0f} rows/s", file=sys.stderr)
+
+
+def import_flights(args) -> int:
+    """Import flights from a file"""
+    input_path = Path(args.input)
+    fmt = detect_format(input_path, args.format)
+    flight_service = FlightService(args.data_file) if args.data_file else FlightService()
+
+    checkpoint = Checkpoint(Path(args.checkpoint or f"{input_path}.checkpoint"), flight_service.data_file)
+    skip = checkpoint.load() if args.resume else 0
+    if skip:
+        print(f"Resuming after {skip:,} already processed records")
+
+    print(f"{'Validating' if args.dry_run else 'Loading'} flights from {input_path} ({fmt}) "
+          f"with {args.workers} worker(s)...")
+
+    state = IngestState(flight_service)
+    state.sync()
+    created_at = format_timestamp(datetime.now(timezone.utc))
+
+    records = islice(enumerate(read_records(input_path, fmt)), skip, None)
+    progress = Progress(quiet=args.quiet)
+    processed = skip
+    created = 0
+    failed = 0
+    errors_shown = 0
+    batch: List[Tuple[int, Dict]] = []
+
+    def report_error(idx: int, error: str):
+        nonlocal failed, errors_shown
+        failed += 1
+        if errors_shown < args.max_errors:
+            errors_shown += 1
+            print(f"✗ Record {idx + 1}: {error}", file=sys.stderr)
+
+    def flush():
+        nonlocal batch, created
+        # Duplicate checks and IDs must account for rows written by others
+        with nullcontext() if args.dry_run else flight_service.lock():
+            if not args.dry_run:
+                state.sync()
+            rows = []
+            for idx, flight in batch:
+                if not state.claim(flight['planeId'], flight['departureTime']):
+                    report_error(idx, f"Duplicate flight: plane {flight['planeId']} "
+                                      f"already has a flight at {flight['departureTime']}")
+                    continue
+                rows.append({
+                    'id': state.next_id,
+                    'plane_id': flight['planeId'],
+                    'origin': flight['origin'],
+                    'destination': flight['destination'],
+                    'departure_time': flight['departureTime'],
+                    'arrival_time': flight['arrivalTime'],
+                    'created_at': created_at
+                })
+                state.next_id += 1
+            if not args.dry_run:
+                if rows:
+                    flight_service.append_flights(rows)
+                checkpoint.save(processed)
+        created += len(rows)
+        batch = []
+
+    for results in validated_chunks(records, args.workers, args.chunk_size):
+        for idx, flight, error in results:
+            processed = idx + 1
+            if error is not None:
+                report_error(idx, error)
+                continue
+
+            batch.append((idx, flight))
+            if len(batch) >= args.batch_size:
+                flush()
+
+        progress.report(processed, created, failed)
+
+    flush()
+    if not args.dry_run:
+        checkpoint.clear()
+    progress.report(processed, created, failed, force=True)
+
+    print(f"\n{'='*60}")
+    print(f"Summary{' (dry run, nothing written)' if args.dry_run else ''}:")
+    print(f"  {'Valid' if args.dry_run else 'Created'}: {created:,}")
+    print(f"  Failed:  {failed:,}")
+    print(f"  Total:   {processed - skip:,}")
+    print(f"  Elapsed: {progress.elapsed:.2f}s ({progress.rate(processed - skip):,.0f} rows/s)")
+    print(f"{'='*60}")
+
+    return 0 if failed == 0 else 1
+
+
+def export_flights(args) -> int:
+    """Export stored flights to a file"""
+    output_path = Path(args.output)
+    fmt = detect_format(output_path, args.format)
+    flight_service = FlightService(args.data_file) if args.data_file else FlightService()
+    progress = Progress()
+
+    flights = flight_service.get_all_flights()
+    if args.plane_id:
+        plane_ids = set(args.plane_id)
+        flights = [f for f in flights if f['plane_id'] in plane_ids]
+
+    records = ({
+        'planeId': f['plane_id'],
+        'origin': f['origin'],
+        'destination': f['destination'],
+        'departureTime': f['departure_time'],
+        'arrivalTime': f['arrival_time']
+    } for f in flights)
+
+    with open(output_path, 'w', newline='') as out:
+        if fmt == "json":
+            json.dump(list(records), out, indent=2)
+        elif fmt == "ndjson":
+            for record in records:
+                out.write(json.dumps(record) + '\n')
+        else:
+            writer = csv.DictWriter(out, fieldnames=API_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+
+    print(f"Exported {len(flights):,} flights to {output_path} ({fmt}) in {progress.elapsed:.2f}s")
+    return 0
+
+
+def canonicalize_flights(args) -> int:
+    """Rewrite stored timestamps in canonical UTC form"""
+    flight_service = FlightService(args.data_file) if args.data_file else FlightService()
+    progress = Progress()
+    changed = flight_service.canonicalize_storage()
+    print(f"Canonicalized timestamps of {changed:,} flights in {progress.elapsed:.2f}s")
+    return 0
+
+
+def positive_int(value: str) -> int:
+    """argparse type for integers of at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Bulk import and export of flight data")
+    parser.add_argument("--data-file", help="CSV storage file relative to the backend directory "
+                                            "(default: data/flights.csv)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import flights from a file")
+    import_parser.add_argument("input", help="Input file (.json, .ndjson/.jsonl or .csv)")
+    import_parser.add_argument("--format", choices=FORMATS, help="Input format (default: from extension)")
+    import_parser.add_argument("--workers", type=positive_int, default=os.cpu_count() or 1,
+                               help="Validation worker processes (default: CPU count)")
+    import_parser.add_argument("--chunk-size", type=positive_int, default=5000,
+                               help="Records per validation task (default: 5000)")
+    import_parser.add_argument("--batch-size", type=positive_int, default=50000,
+                               help="Rows per storage write (default: 50000)")
+    import_parser.add_argument("--dry-run", action="store_true",
+                               help="Validate and check duplicates without writing")
+    import_parser.add_argument("--resume", action="store_true",
+                               help="Skip records committed by a previous, interrupted import")
+    import_parser.add_argument("--checkpoint", help="Checkpoint file (default: <input>.checkpoint)")
+    import_parser.add_argument("--max-errors", type=int, default=20,
+                               help="Maximum number of record errors to print (default: 20)")
+    import_parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    import_parser.set_defaults(func=import_flights)
+
+    export_parser = subparsers.add_parser("export", help="Export stored flights to a file")
+    export_parser.add_argument("output", help="Output file (.json, .ndjson/.jsonl or .csv)")
+    export_parser.add_argument("--format", choices=FORMATS, help="Output format (default: from extension)")
+    export_parser.add_argument("--plane-id", action="append", help="Only export this plane (repeatable)")
+    export_parser.set_defaults(func=export_flights)
+
+    canonicalize_parser = subparsers.add_parser(
+        "canonicalize", help="Rewrite stored timestamps in canonical UTC form"
+    )
+    canonicalize_parser.set_defaults(func=canonicalize_flights)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, PayloadCache, negotiate_encoding
+
+
+@pytest.fixture
+def all_encodings(monkeypatch):
+    monkeypatch.setattr(compression, "available_encodings", lambda: ["zstd", "br", "gzip"])
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip;q=0, *;q=1", "zstd"),
+    ("gzip;q=0", None),
+    ("*;q=0", None),
+    ("gzip;q=0.5;foo=1", "gzip"),
+    ("gzip;foo=1;q=0.5, br;q=0.4", "gzip"),
+    ("gzip;q=0.5, br;q=0.5", "br"),
+    ("GZIP, BR;Q=0.1", "gzip"),
+    ("gzip;q=abc", None),
+    ("gzip;q=, br", "br"),
+    ("zstd;q=nonsense, gzip;q=0.1", "gzip"),
+])
+def test_negotiate_encoding(all_encodings, header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_put_evicts_by_bytes():
+    cache = PayloadCache(max_entries=10, max_bytes=100)
+    cache.put("a", 1, b"a" * 40)
+    cache.put("b", 1, b"b" * 40)
+    assert cache.get("a", 1) is not None  # "a" is now most recently used
+    cache.put("c", 1, b"c" * 40)
+
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == b"a" * 40
+    assert cache.get("c", 1) == b"c" * 40
+    assert cache.size_bytes == 80
+
+
+def test_put_skips_bodies_larger_than_limit():
+    cache = PayloadCache(max_bytes=10)
+    cache.put("a", 1, b"x" * 11)
+    assert cache.get("a", 1) is None
+    assert cache.size_bytes == 0
+
+
+def test_new_version_clears_cache():
+    cache = PayloadCache()
+    cache.put("a", 1, b"old-a")
+    cache.put("b", 1, b"old-b")
+    assert cache.get("a", 2) is None
+
+    cache.put("a", 2, b"new-a")
+    assert cache.get("a", 2) == b"new-a"
+    assert cache.get("b", 2) is None
+    assert cache.get("a", 1) is None
+    assert cache.size_bytes == len(b"new-a")
+
+
+def test_get_encoded_counts_compressed_copies():
+    cache = PayloadCache()
+    body = b'{"flights": []}' * 100
+    cache.put("a", 1, body)
+
+    encoded = cache.get_encoded("a", 1, body, "gzip")
+    assert gzip.decompress(encoded) == body
+    assert cache.size_bytes == len(body) + len(encoded)
+    assert cache.get_encoded("a", 1, body, "gzip") is encoded
+
+    # A compressed copy pushing the cache over its limit evicts older entries
+    cache.max_bytes = len(body) * 2
+    other = b"y" * len(body)
+    cache.put("b", 1, other)
+    assert cache.get("a", 1) is None
+    assert cache.size_bytes == len(other)
+
+
+def test_get_encoded_for_stale_version_is_not_cached():
+    cache = PayloadCache()
+    body = b"z" * 2000
+    cache.put("a", 1, body)
+    encoded = cache.get_encoded("a", 2, body, "gzip")
+    assert gzip.decompress(encoded) == body
+    assert cache.size_bytes == len(body)
+
+
+PAYLOAD = [{"id": idx, "planeId": f"PLANE{idx % 7}"} for idx in range(500)]
+CHUNKS = [f'{{"chunk": {idx}, "padding": "{"x" * 200}"}}\n'.encode() for idx in range(20)]
+
+
+async def small(request):
+    return JSONResponse({"ok": True})
+
+
+async def large(request):
+    return JSONResponse(PAYLOAD)
+
+
+async def stream(request):
+    async def generate():
+        for chunk in CHUNKS:
+            yield chunk
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[
+        Route("/small", small),
+        Route("/large", large),
+        Route("/stream", stream),
+    ])
+    app.add_middleware(CompressionMiddleware, min_size=1024)
+    return TestClient(app)
+
+
+def test_small_body_passes_through_with_vary(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"ok": True}
+
+
+def test_large_body_is_compressed(client):
+    with client.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw) == JSONResponse(PAYLOAD).body
+
+
+def test_streamed_body_decodes_to_original(client):
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw) == b"".join(CHUNKS)
+
+
+def test_identity_is_untouched(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == PAYLOAD
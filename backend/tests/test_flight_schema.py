@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import FlightCreate
+from app.utils.timeutils import parse_timestamp
+
+
+def _flight(departure, arrival):
+    return FlightCreate(planeId='PLANE_A', origin='HKG', destination='NRT',
+                        departureTime=departure, arrivalTime=arrival)
+
+
+def test_timestamps_are_canonicalized():
+    flight = _flight('2024-01-01T08:00:00+08:00', '2024-01-01T05:00:00')
+    assert flight.departureTime == '2024-01-01T00:00:00Z'
+    assert flight.arrivalTime == '2024-01-01T05:00:00Z'
+
+
+def test_arrival_must_follow_departure_across_offsets():
+    with pytest.raises(ValidationError, match='Arrival time must be after departure time'):
+        _flight('2024-01-01T08:00:00+08:00', '2024-01-01T00:00:00Z')
+
+
+def test_ingest_does_not_use_request_parse_cache():
+    parse_timestamp.cache_clear()
+    for minute in range(10):
+        _flight(f'2024-01-01T00:{minute:02d}:00Z', f'2024-01-01T01:{minute:02d}:00Z')
+    assert parse_timestamp.cache_info().currsize == 0
+
+
+@pytest.mark.parametrize('value', ['2024-01-01T00:00:00.5Z', '2024-01-01T00:00:00.000001+08:00'])
+def test_sub_second_precision_is_rejected(value):
+    with pytest.raises(ValidationError, match='Sub-second precision is not supported'):
+        _flight(value, '2024-01-02T00:00:00Z')
+
+
+def test_zero_fraction_is_accepted():
+    assert _flight('2024-01-01T00:00:00.000Z', '2024-01-02T00:00:00Z').departureTime == '2024-01-01T00:00:00Z'
+
+
+def test_invalid_timestamp_is_rejected():
+    with pytest.raises(ValidationError, match='Invalid ISO 8601 datetime format'):
+        _flight('yesterday', '2024-01-02T00:00:00Z')
@@ -0,0 +1,73 @@
+import csv
+
+import pytest
+
+from app.services import FlightService
+from app.services.flight_service import FIELDNAMES
+
+LEGACY_ROWS = [
+    ['1', 'PLANE_A', 'HKG', 'NRT', '2022-01-01T08:00:00+08:00', '2022-01-01T05:00:00.000Z', '2024-01-15T10:30:00.123456Z'],
+    ['2', 'PLANE_A', 'NRT', 'HKG', '2022-01-01T06:00:00Z', '2022-01-01T10:00:00Z', '2024-01-15T10:30:00Z'],
+]
+
+
+@pytest.fixture
+def legacy_file(tmp_path):
+    data_file = tmp_path / "flights.csv"
+    with open(data_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(LEGACY_ROWS)
+    return data_file
+
+
+def test_legacy_rows_are_canonicalized_on_open(legacy_file, caplog):
+    flight_service = FlightService(str(legacy_file))
+
+    # Sub-second values are truncated, but not silently
+    assert 'Truncated sub-second timestamps of 1 flight(s)' in caplog.text
+    assert 'ids 1' in caplog.text
+
+    flights = flight_service.get_all_flights()
+    assert flights[0]['departure_time'] == '2022-01-01T00:00:00Z'
+    assert flights[0]['arrival_time'] == '2022-01-01T05:00:00Z'
+    assert flights[0]['created_at'] == '2024-01-15T10:30:00Z'
+    assert flights[1]['departure_time'] == '2022-01-01T06:00:00Z'
+
+
+def test_duplicate_of_legacy_row_is_rejected(legacy_file):
+    flight_service = FlightService(str(legacy_file))
+
+    with pytest.raises(ValueError):
+        flight_service.create_flight({
+            'planeId': 'PLANE_A',
+            'origin': 'HKG',
+            'destination': 'NRT',
+            'departureTime': '2022-01-01T00:00:00Z',
+            'arrivalTime': '2022-01-01T05:00:00Z'
+        })
+
+    result = flight_service.create_flights_bulk([{
+        'planeId': 'PLANE_A',
+        'origin': 'HKG',
+        'destination': 'NRT',
+        'departureTime': '2022-01-01T00:00:00Z',
+        'arrivalTime': '2022-01-01T05:00:00Z'
+    }])
+    assert result['created'] == 0
+    assert result['failed'] == 1
+
+
+def test_canonical_file_is_not_rewritten(tmp_path):
+    flight_service = FlightService(str(tmp_path / "flights.csv"))
+    flight_service.create_flight({
+        'planeId': 'PLANE_A',
+        'origin': 'HKG',
+        'destination': 'NRT',
+        'departureTime': '2022-01-01T00:00:00Z',
+        'arrivalTime': '2022-01-01T05:00:00Z'
+    })
+    version = flight_service.get_data_version()
+
+    FlightService(str(tmp_path / "flights.csv"))
+    assert flight_service.get_data_version() == version
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+import load_flights
+from app.services import FlightService
+
+
+def _record(plane_id, day, hour, origin="HKG", destination="NRT"):
+    return {
+        "planeId": plane_id,
+        "origin": origin,
+        "destination": destination,
+        "departureTime": f"2024-01-{day:02d}T{hour:02d}:00:00Z",
+        "arrivalTime": f"2024-01-{day:02d}T{hour:02d}:45:00Z",
+    }
+
+
+RECORDS = [_record(f"PLANE_{p}", day, hour) for p in "AB" for day in (1, 2) for hour in (0, 6, 12)]
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return tmp_path / "flights.csv"
+
+
+def _write_ndjson(path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+    return path
+
+
+def _import(data_file, input_path, *options):
+    return load_flights.main([
+        "--data-file", str(data_file), "import", str(input_path),
+        "--workers", "1", "--quiet", *options
+    ])
+
+
+def _stored(data_file):
+    return [
+        {k: v for k, v in flight.items() if k != 'created_at'}
+        for flight in FlightService(str(data_file)).get_all_flights()
+    ]
+
+
+def test_import_assigns_sequential_ids(tmp_path, data_file):
+    input_path = _write_ndjson(tmp_path / "in.ndjson", RECORDS)
+
+    assert _import(data_file, input_path, "--batch-size", "4") == 0
+
+    stored = _stored(data_file)
+    assert [int(f['id']) for f in stored] == list(range(1, len(RECORDS) + 1))
+    assert [f['departure_time'] for f in stored] == [r['departureTime'] for r in RECORDS]
+    assert not (tmp_path / "in.ndjson.checkpoint").exists()
+
+
+def test_duplicates_within_batch_and_against_stored_rows(tmp_path, data_file, capsys):
+    FlightService(str(data_file)).create_flight(RECORDS[0])
+    records = [RECORDS[0], RECORDS[1], RECORDS[1], RECORDS[2]]
+    input_path = _write_ndjson(tmp_path / "in.ndjson", records)
+
+    assert _import(data_file, input_path) == 1
+
+    errors = capsys.readouterr().err
+    assert "Record 1: Duplicate flight" in errors
+    assert "Record 3: Duplicate flight" in errors
+    stored = _stored(data_file)
+    assert [f['departure_time'] for f in stored] == [r['departureTime'] for r in RECORDS[:3]]
+    assert [int(f['id']) for f in stored] == [1, 2, 3]
+
+
+def test_duplicates_across_batches(tmp_path, data_file):
+    input_path = _write_ndjson(tmp_path / "in.ndjson", RECORDS + RECORDS[:2])
+
+    assert _import(data_file, input_path, "--batch-size", "2") == 1
+    assert len(_stored(data_file)) == len(RECORDS)
+
+
+def test_invalid_lines_are_failed_records(tmp_path, data_file, capsys):
+    input_path = tmp_path / "in.ndjson"
+    input_path.write_text(json.dumps(RECORDS[0]) + "\n{not json\n" + json.dumps(RECORDS[1]) + "\n")
+
+    assert _import(data_file, input_path) == 1
+
+    assert "Record 2: line 2: invalid JSON" in capsys.readouterr().err
+    assert len(_stored(data_file)) == 2
+
+
+@pytest.mark.parametrize("content", ['{"planes": []}', '"flights"', '{"flights": {}}', '[{'])
+def test_unusable_json_document_is_an_error(tmp_path, data_file, content, capsys):
+    input_path = tmp_path / "in.json"
+    input_path.write_text(content)
+
+    assert _import(data_file, input_path) == 2
+    assert "Error:" in capsys.readouterr().err
+
+
+def test_dry_run_writes_nothing(tmp_path, data_file):
+    input_path = _write_ndjson(tmp_path / "in.ndjson", RECORDS + RECORDS[:1])
+
+    assert _import(data_file, input_path, "--dry-run", "--batch-size", "2") == 1
+
+    assert _stored(data_file) == []
+    assert not (tmp_path / "in.ndjson.checkpoint").exists()
+
+
+def test_resume_skips_committed_records(tmp_path, data_file, monkeypatch):
+    input_path = _write_ndjson(tmp_path / "in.ndjson", RECORDS)
+    append_flights = FlightService.append_flights
+    calls = []
+
+    def failing_append(self, rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise OSError("disk full")
+        append_flights(self, rows)
+
+    monkeypatch.setattr(FlightService, "append_flights", failing_append)
+    assert _import(data_file, input_path, "--batch-size", "4") == 2
+    assert len(_stored(data_file)) == 4
+    checkpoint = json.loads((tmp_path / "in.ndjson.checkpoint").read_text())
+    assert checkpoint["processed"] == 4
+
+    monkeypatch.setattr(FlightService, "append_flights", append_flights)
+    # Re-importing committed records would fail them as duplicates
+    assert _import(data_file, input_path, "--batch-size", "4", "--resume") == 0
+
+    stored = _stored(data_file)
+    assert [f['departure_time'] for f in stored] == [r['departureTime'] for r in RECORDS]
+    assert [int(f['id']) for f in stored] == list(range(1, len(RECORDS) + 1))
+    assert not (tmp_path / "in.ndjson.checkpoint").exists()
+
+
+def test_resume_rejects_checkpoint_of_another_data_file(tmp_path, data_file, capsys):
+    input_path = _write_ndjson(tmp_path / "in.ndjson", RECORDS)
+    load_flights.Checkpoint(tmp_path / "in.ndjson.checkpoint", tmp_path / "other.csv").save(4)
+
+    assert _import(data_file, input_path, "--resume") == 2
+
+    assert "belongs to data file" in capsys.readouterr().err
+    assert _stored(data_file) == []
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_export_then_import_round_trips(tmp_path, data_file, fmt):
+    input_path = _write_ndjson(tmp_path / "in.ndjson", RECORDS)
+    assert _import(data_file, input_path) == 0
+
+    export_path = tmp_path / f"export.{fmt}"
+    assert load_flights.main(["--data-file", str(data_file), "export", str(export_path)]) == 0
+
+    copy_file = tmp_path / "copy.csv"
+    assert _import(copy_file, export_path) == 0
+    assert _stored(copy_file) == _stored(data_file)
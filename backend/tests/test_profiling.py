@@ -0,0 +1,80 @@
+import cProfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes.admin import router as admin_router
+from app.utils.profiling import ProfileStore, ProfilingMiddleware, profile_store
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILING_ADMIN_TOKEN", TOKEN)
+    # The admin routes and the middleware share the module-level store
+    monkeypatch.setattr(profile_store, "profile_dir", tmp_path / "profiles")
+    monkeypatch.setattr(profile_store, "max_profiles", 3)
+    return profile_store
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, store=store)
+    app.include_router(admin_router)
+
+    @app.get("/work")
+    async def work():
+        return {"total": sum(range(1000))}
+
+    return TestClient(app)
+
+
+def test_admin_routes_require_token(client):
+    assert client.get("/api/v1/admin/profiles").status_code == 403
+    assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def test_request_without_token_is_not_profiled(client, store):
+    response = client.get("/work?profile=1")
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert store.list_profiles() == []
+
+
+def test_profiled_request_returns_profile_id(client):
+    headers = {"X-Admin-Token": TOKEN}
+    response = client.get("/work?profile=1", headers=headers)
+    profile_id = response.headers["X-Profile-Id"]
+
+    listing = client.get("/api/v1/admin/profiles", headers=headers).json()
+    assert [p["id"] for p in listing["profiles"]] == [profile_id]
+    assert listing["profiles"][0]["createdAt"].endswith("Z")
+
+    report = client.get(f"/api/v1/admin/profiles/{profile_id}?format=text", headers=headers)
+    assert report.status_code == 200
+    assert "function calls" in report.text
+
+    download = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=headers)
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/octet-stream"
+
+
+def test_ring_evicts_down_to_max_profiles(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles"), max_profiles=3)
+    ids = []
+    for idx in range(5):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        profiler.disable()
+        ids.append(store.save(profiler, "GET", f"/path/{idx}", 1.0))
+
+    assert [p["id"] for p in store.list_profiles()] == list(reversed(ids[-3:]))
+
+
+@pytest.mark.parametrize("profile_id", ["..%2F..%2Fetc%2Fpasswd", "a%5Cb", ".hidden"])
+def test_profile_id_with_path_separator_is_not_found(client, profile_id):
+    response = client.get(f"/api/v1/admin/profiles/{profile_id}", headers={"X-Admin-Token": TOKEN})
+    assert response.status_code == 404
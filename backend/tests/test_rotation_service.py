@@ -0,0 +1,136 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services import FlightService, GanttService, RotationService
+from app.services.rotation_service import _PlaneChain
+
+AIRPORTS = ['HKG', 'NRT', 'TPE', 'LAX']
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _random_legs(rng: random.Random, count: int):
+    """Generate consecutive legs of a single plane"""
+    legs = []
+    t = BASE_TIME
+    for idx in range(count):
+        departure = t + timedelta(minutes=rng.randint(30, 300))
+        arrival = departure + timedelta(minutes=rng.randint(60, 700))
+        t = arrival
+        legs.append({
+            'id': idx + 1,
+            'origin': rng.choice(AIRPORTS),
+            'destination': rng.choice(AIRPORTS),
+            'departure_time': departure.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'arrival_time': arrival.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'departure': departure,
+            'arrival': arrival,
+            'duration_minutes': int((arrival - departure).total_seconds() / 60)
+        })
+    return legs
+
+
+def _summary(chain: _PlaneChain):
+    return [
+        ([leg['id'] for leg in r['legs']], r['base'], r['complete'], r['block_minutes'], r['turnarounds'])
+        for r in chain.rotations
+    ]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_splice_matches_rebuild(seed):
+    rng = random.Random(seed)
+    legs = _random_legs(rng, rng.randint(1, 40))
+
+    rebuilt = _PlaneChain()
+    rebuilt.rebuild(list(legs))
+
+    spliced = _PlaneChain()
+    order = list(legs)
+    rng.shuffle(order)
+    split = rng.randint(1, len(order))
+    spliced.rebuild(order[:split])
+    for leg in order[split:]:
+        spliced.splice(leg)
+
+    assert [leg['id'] for leg in spliced.legs] == [leg['id'] for leg in rebuilt.legs]
+    assert spliced.rotation_keys == rebuilt.rotation_keys
+    assert _summary(spliced) == _summary(rebuilt)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_rotations_in_range_matches_scan(seed):
+    rng = random.Random(seed)
+    legs = _random_legs(rng, 60)
+    chain = _PlaneChain()
+    order = list(legs)
+    rng.shuffle(order)
+    chain.rebuild(order[:10])
+    for leg in order[10:]:
+        chain.splice(leg)
+
+    start_dt = BASE_TIME + timedelta(hours=rng.randint(0, 400))
+    end_dt = start_dt + timedelta(hours=rng.randint(0, 200))
+    expected = [
+        r for r in chain.rotations
+        if r['legs'][0]['departure'] <= end_dt and r['legs'][-1]['arrival'] >= start_dt
+    ]
+    assert chain.rotations_in_range(start_dt, end_dt) == expected
+
+
+def test_service_incremental_matches_fresh(tmp_path):
+    rng = random.Random(7)
+    flight_service = FlightService(str(tmp_path / "flights.csv"))
+    rotation_service = RotationService(flight_service)
+
+    flights = []
+    for plane in ('P1', 'P2'):
+        for leg in _random_legs(rng, 80):
+            flights.append({
+                'planeId': plane,
+                'origin': leg['origin'],
+                'destination': leg['destination'],
+                'departureTime': leg['departure_time'],
+                'arrivalTime': leg['arrival_time']
+            })
+    rng.shuffle(flights)
+
+    start_dt = BASE_TIME
+    end_dt = BASE_TIME + timedelta(days=60)
+    for chunk in (flights[:100], flights[100:110], flights[110:]):
+        flight_service.create_flights_bulk(chunk)
+        rotation_service.get_rotations_data(['P1', 'P2'], start_dt, end_dt)
+
+    fresh = RotationService(flight_service)
+    assert (rotation_service.get_rotations_data(['P1', 'P2'], start_dt, end_dt)
+            == fresh.get_rotations_data(['P1', 'P2'], start_dt, end_dt))
+
+
+def _trip_ids(gantt_service: GanttService):
+    data = gantt_service.get_trips_data(['PLANE_A'], BASE_TIME, BASE_TIME + timedelta(days=1))
+    return [trip['id'] for trip in data['planes'][0]['trips']]
+
+
+def test_last_row_without_newline_is_read(tmp_path):
+    data_file = tmp_path / 'flights.csv'
+    data_file.write_bytes(
+        b'id,plane_id,origin,destination,departure_time,arrival_time,created_at\r\n'
+        b'1,PLANE_A,HKG,NRT,2025-01-01T01:00:00Z,2025-01-01T05:00:00Z,2025-01-01T00:00:00Z\r\n'
+        b'2,PLANE_A,NRT,HKG,2025-01-01T06:00:00Z,2025-01-01T10:00:00Z,2025-01-01T00:00:00Z'
+    )
+    flight_service = FlightService(str(data_file))
+    gantt_service = GanttService(flight_service, RotationService(flight_service))
+    assert _trip_ids(gantt_service) == [1, 2]
+
+    # A row added by hand while the service runs is not glued to the next append
+    with open(data_file, 'ab') as f:
+        f.write(b'\r\n3,PLANE_A,HKG,TPE,2025-01-01T11:00:00Z,2025-01-01T13:00:00Z,2025-01-01T00:00:00Z')
+    flight_service.create_flight({
+        'planeId': 'PLANE_A',
+        'origin': 'TPE',
+        'destination': 'HKG',
+        'departureTime': '2025-01-01T14:00:00Z',
+        'arrivalTime': '2025-01-01T16:00:00Z'
+    })
+    assert _trip_ids(gantt_service) == [1, 2, 3, 4]